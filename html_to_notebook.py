@@ -9,89 +9,405 @@ the original notebook structure with markdown and code cells.
 
 import argparse
 import html
+import io
 import json
+import mmap
+import os
 import re
 import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Callable
 
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
     import nbformat
 except ImportError as e:
     print(f"Missing required dependency: {e}")
     print("Install with: pip install beautifulsoup4 nbformat")
     sys.exit(1)
 
+# Prefer the C-backed lxml parser when available; it is several times
+# faster than the pure-Python html.parser on large exported notebooks.
+try:
+    from lxml import etree
+    BS_PARSER = 'lxml'
+except ImportError:
+    etree = None
+    BS_PARSER = 'html.parser'
+
+# selectolax (Lexbor) is faster still: the tree and CSS selection are
+# both implemented in C. Used automatically when installed.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# numba lets us strip pilcrows/trailing whitespace from megabyte-scale
+# cells in a compiled byte-level loop instead of the regex engine
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Patterns used per cell / per file; compiled once at import time
+_CELL_CLASS_RE = re.compile(r'jp-Cell.*jp-Notebook-cell')
+_PROMPT_RE = re.compile(r'In\s*\[(\d+)\]:')
+# Collapses runs of blank lines to one blank line and runs of spaces to
+# one space in a single pass over the string
+_WS_RE = re.compile(r'(\n\s*\n\s*\n+)| {2,}')
+
+# Restrict bs4 parsing to the cell subtrees; exported HTML is dominated
+# by non-cell markup (CSS, MathJax config, outputs) we never look at
+_STRAINER = SoupStrainer('div', class_=_CELL_CLASS_RE)
+
+# Drops the paragraph symbol and strips trailing whitespace before each
+# newline without splitting the text into per-line strings
+_PILCROW_TABLE = str.maketrans('', '', '¶')
+_TRAIL_WS_RE = re.compile(r'[^\S\n]+(?=\n|$)')
+
+# Cells smaller than this go through the regex path; JIT only pays off
+# on very large inputs
+_NUMBA_MIN_LEN = 64 * 1024
+
+if njit is not None:
+    @njit(cache=True)
+    def _strip_pilcrow_trailws(buf, out):
+        """Byte-level stripper over UTF-8: drops pilcrows (0xC2 0xB6)
+        and horizontal whitespace before each newline or the end of the
+        buffer. Writes into out and returns the new length."""
+        n = buf.shape[0]
+        w = 0
+        i = 0
+        while i < n:
+            b = buf[i]
+            if b == 0xC2 and i + 1 < n and buf[i + 1] == 0xB6:
+                i += 2  # pilcrow: drop both bytes
+                continue
+            if b == 0x0A:
+                # Newline: drop any trailing whitespace written before it
+                # (space, tab, CR, VT, FF, and UTF-8 NBSP 0xC2 0xA0)
+                while w > 0:
+                    p = out[w - 1]
+                    if p == 0x20 or p == 0x09 or p == 0x0D or p == 0x0B or p == 0x0C:
+                        w -= 1
+                    elif p == 0xA0 and w > 1 and out[w - 2] == 0xC2:
+                        w -= 2
+                    else:
+                        break
+            out[w] = b
+            w += 1
+            i += 1
+        # Trailing whitespace at the very end of the buffer
+        while w > 0:
+            p = out[w - 1]
+            if p == 0x20 or p == 0x09 or p == 0x0D or p == 0x0B or p == 0x0C:
+                w -= 1
+            elif p == 0xA0 and w > 1 and out[w - 2] == 0xC2:
+                w -= 2
+            else:
+                break
+        return w
+
 def info_print(*args, **kwargs):
     """Print info messages to stderr"""
     print(*args, **kwargs, file=sys.stderr)
 
+
+class _Bs4Backend:
+    """HTML extraction backend built on BeautifulSoup."""
+
+    name = 'bs4'
+
+    def parse(self, markup):
+        return BeautifulSoup(markup, BS_PARSER, parse_only=_STRAINER)
+
+    def cells(self, tree):
+        # The strainer already limited the tree to cell containers, so
+        # the top-level divs are exactly the cells
+        return tree.find_all('div', recursive=False)
+
+    def classes(self, node):
+        return node.get('class', [])
+
+    def markdown_div(self, cell_div):
+        return cell_div.select_one('div.jp-RenderedMarkdown')
+
+    def code_container(self, cell_div):
+        # New JupyterLab structure first, then the older one
+        return cell_div.select_one('div.jp-CodeMirrorEditor, div.CodeMirror')
+
+    def highlight_div(self, code_container):
+        return code_container.select_one('div.highlight')
+
+    def pre_tag(self, highlight_div):
+        return highlight_div.select_one('pre')
+
+    def prompt_text(self, cell_div):
+        prompt_div = cell_div.select_one('div.jp-InputPrompt')
+        return prompt_div.get_text() if prompt_div else ''
+
+    def get_text(self, node):
+        return node.get_text()
+
+    def attr(self, node, key, default=''):
+        return node.get(key, default)
+
+    def children(self, node):
+        """Yield (tag_name, element) for tags and (None, text) for text."""
+        for child in node.children:
+            name = getattr(child, 'name', None)
+            if name is not None:
+                yield name.lower(), child
+            else:
+                yield None, str(child)
+
+    def list_items(self, node):
+        return node.find_all('li', recursive=False)
+
+
+if etree is not None:
+    # One parser instance shared across all files; constructing it per
+    # file is measurable setup cost when batch-converting many inputs
+    _LXML_HTML_PARSER = etree.HTMLParser(recover=True, huge_tree=True)
+
+    def _xp_class(name):
+        """XPath predicate matching a whole class-attribute token."""
+        return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+    # Selectors applied per cell, compiled once instead of re-parsing
+    # the XPath string on every call
+    _XP_CELLS = etree.XPath(
+        f'.//div[{_xp_class("jp-Cell")} and {_xp_class("jp-Notebook-cell")}]')
+    _XP_MARKDOWN = etree.XPath(f'.//div[{_xp_class("jp-RenderedMarkdown")}]')
+    _XP_CODE_CONTAINER = etree.XPath(
+        f'.//div[{_xp_class("jp-CodeMirrorEditor")} or {_xp_class("CodeMirror")}]')
+    _XP_HIGHLIGHT = etree.XPath(f'.//div[{_xp_class("highlight")}]')
+    _XP_PRE = etree.XPath('.//pre')
+    _XP_PROMPT = etree.XPath(f'.//div[{_xp_class("jp-InputPrompt")}]')
+
+
+class _LxmlBackend:
+    """HTML extraction backend built directly on lxml.etree."""
+
+    name = 'lxml'
+
+    def parse(self, markup):
+        if hasattr(markup, 'read'):
+            markup = markup.read()
+        return etree.fromstring(markup, _LXML_HTML_PARSER)
+
+    def cells(self, tree):
+        if tree is None:  # lxml yields no root for empty input
+            return []
+        return _XP_CELLS(tree)
+
+    def classes(self, node):
+        return (node.get('class') or '').split()
+
+    def markdown_div(self, cell_div):
+        found = _XP_MARKDOWN(cell_div)
+        return found[0] if found else None
+
+    def code_container(self, cell_div):
+        found = _XP_CODE_CONTAINER(cell_div)
+        return found[0] if found else None
+
+    def highlight_div(self, code_container):
+        found = _XP_HIGHLIGHT(code_container)
+        return found[0] if found else None
+
+    def pre_tag(self, highlight_div):
+        found = _XP_PRE(highlight_div)
+        return found[0] if found else None
+
+    def prompt_text(self, cell_div):
+        found = _XP_PROMPT(cell_div)
+        return ''.join(found[0].itertext()) if found else ''
+
+    def get_text(self, node):
+        return ''.join(node.itertext())
+
+    def attr(self, node, key, default=''):
+        value = node.get(key)
+        return value if value is not None else default
+
+    def children(self, node):
+        """Yield (tag_name, element) for tags and (None, text) for text."""
+        if node.text:
+            yield None, node.text
+        for child in node:
+            tag = child.tag
+            if isinstance(tag, str):  # skip comments/PIs
+                yield tag.lower(), child
+            if child.tail:
+                yield None, child.tail
+
+    def list_items(self, node):
+        return [child for child in node if child.tag == 'li']
+
+
+class _SelectolaxBackend:
+    """HTML extraction backend built on selectolax's Lexbor parser."""
+
+    name = 'selectolax'
+
+    def parse(self, markup):
+        if hasattr(markup, 'read'):
+            markup = markup.read()
+        return LexborHTMLParser(markup)
+
+    def cells(self, tree):
+        return tree.css('div.jp-Cell.jp-Notebook-cell')
+
+    def classes(self, node):
+        return (node.attributes.get('class') or '').split()
+
+    def markdown_div(self, cell_div):
+        return cell_div.css_first('div.jp-RenderedMarkdown')
+
+    def code_container(self, cell_div):
+        return (cell_div.css_first('div.jp-CodeMirrorEditor')
+                or cell_div.css_first('div.CodeMirror'))
+
+    def highlight_div(self, code_container):
+        return code_container.css_first('div.highlight')
+
+    def pre_tag(self, highlight_div):
+        return highlight_div.css_first('pre')
+
+    def prompt_text(self, cell_div):
+        prompt_div = cell_div.css_first('div.jp-InputPrompt')
+        return prompt_div.text() if prompt_div else ''
+
+    def get_text(self, node):
+        return node.text()
+
+    def attr(self, node, key, default=''):
+        value = node.attributes.get(key)
+        return value if value is not None else default
+
+    def children(self, node):
+        """Yield (tag_name, element) for tags and (None, text) for text."""
+        for child in node.iter(include_text=True):
+            if child.tag == '-text':
+                yield None, child.text_content or ''
+            elif not child.tag.startswith('-'):
+                yield child.tag, child
+
+    def list_items(self, node):
+        return [child for child in node.iter() if child.tag == 'li']
+
+
+def _default_backend():
+    """Pick the fastest available extraction backend."""
+    if LexborHTMLParser is not None:
+        return _SelectolaxBackend()
+    if etree is not None:
+        return _LxmlBackend()
+    return _Bs4Backend()
+
 class NotebookConverter:
     """Converts HTML exported from Jupyter to .ipynb format."""
-    
-    def __init__(self, verbose=False):
+
+    kernel_spec = {
+        "display_name": "Python 3",
+        "language": "python",
+        "name": "python3"
+    }
+
+    _LANGUAGE_INFO = {
+        'name': 'python',
+        'version': '3.8.0',
+        'mimetype': 'text/x-python',
+        'codemirror_mode': {'name': 'ipython', 'version': 3},
+        'pygments_lexer': 'ipython3',
+        'nbconvert_exporter': 'python',
+        'file_extension': '.py'
+    }
+
+    # Notebook metadata is fully static, so build it once at class
+    # creation rather than per conversion
+    _METADATA_TEMPLATE = {
+        'kernelspec': kernel_spec,
+        'language_info': _LANGUAGE_INFO,
+    }
+
+    def __init__(self, verbose=False, backend=None):
         self.notebook_version = 4
-        self.kernel_spec = {
-            "display_name": "Python 3",
-            "language": "python",
-            "name": "python3"
-        }
         self.verbose = verbose
+        self.backend = backend if backend is not None else _default_backend()
         
-    def html_to_notebook(self, html_paths: List[Union[str, Path]]) -> nbformat.NotebookNode:
+    def html_to_notebook(self, html_paths: List[Union[str, Path]]) -> Dict:
         """
         Convert HTML file(s) to Jupyter notebook.
-        
+
         Args:
             html_paths: List of paths to input HTML files
-            
+
         Returns:
-            Notebook object with all cells from input files
+            Notebook JSON structure with all cells from input files
         """
+        if len(html_paths) > 1:
+            # Per-file extraction is completely independent, so farm the
+            # files out to worker processes; executor.map preserves the
+            # input order
+            max_workers = min(len(html_paths), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                cell_lists = list(executor.map(self._parse_file, html_paths))
+        else:
+            cell_lists = [self._parse_file(p) for p in html_paths]
+
         all_cells = []
-        
-        for html_path in html_paths:
-            html_path = Path(html_path)
-            if not html_path.exists():
-                print(f"Warning: HTML file not found: {html_path}", file=sys.stderr)
-                continue
-                
-            # Parse HTML and extract cells
-            with open(html_path, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
-                
-            cells = self._extract_cells(soup)
+        for cells in cell_lists:
             all_cells.extend(cells)
-            if self.verbose:
-                info_print(f"Extracted {len(cells)} cells from {html_path}")
-        
+
         notebook = self._create_notebook(all_cells)
         if self.verbose:
             info_print(f"Total: {len(all_cells)} cells")
         return notebook
+
+    def _parse_file(self, html_path: Union[str, Path]) -> List[Dict]:
+        """Parse one HTML file and return its extracted cells."""
+        html_path = Path(html_path)
+        if not html_path.exists():
+            print(f"Warning: HTML file not found: {html_path}", file=sys.stderr)
+            return []
+
+        # Parse HTML and extract cells; map the file read-only instead
+        # of materializing it as a Python string, so the parser consumes
+        # the bytes straight from the OS page cache and the whole-file
+        # UTF-8 decode is skipped
+        with open(html_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    tree = self.backend.parse(mm)
+            else:
+                tree = self.backend.parse(b'')
+
+        cells = self._extract_cells(tree)
+        if self.verbose:
+            info_print(f"Extracted {len(cells)} cells from {html_path}")
+        return cells
     
-    def _extract_cells(self, soup: BeautifulSoup) -> List[Dict]:
+    def _extract_cells(self, tree) -> List[Dict]:
         """Extract all cells from parsed HTML."""
         cells = []
-        
-        # Find all cell containers - updated selector for current JupyterLab
-        # Try both old and new selectors for backward compatibility
-        cell_divs = soup.find_all('div', class_=re.compile(r'jp-Cell.*jp-Notebook-cell'))
-        
-        if not cell_divs:
-            # Try older selector format
-            cell_divs = soup.find_all('div', class_=lambda x: x and 'jp-Cell' in x and 'jp-Notebook-cell' in x)
-        
+
+        cell_divs = self.backend.cells(tree)
+
         if self.verbose:
             info_print(f"Found {len(cell_divs)} cell divs")
-        
+
         for i, cell_div in enumerate(cell_divs):
-            cell_classes = ' '.join(cell_div.get('class', []))
-            
+            cell_classes = frozenset(self.backend.classes(cell_div))
+
             if self.verbose:
-                info_print(f"Cell {i}: classes = {cell_classes[:50]}...")
-            
+                info_print(f"Cell {i}: classes = {' '.join(cell_classes)[:50]}...")
+
             if 'jp-MarkdownCell' in cell_classes:
                 cell = self._extract_markdown_cell(cell_div)
             elif 'jp-CodeCell' in cell_classes:
@@ -109,8 +425,8 @@ class NotebookConverter:
     def _extract_markdown_cell(self, cell_div) -> Optional[Dict]:
         """Extract markdown cell content."""
         # Find the rendered markdown content
-        markdown_div = cell_div.find('div', class_='jp-RenderedMarkdown')
-        if not markdown_div:
+        markdown_div = self.backend.markdown_div(cell_div)
+        if markdown_div is None:
             if self.verbose:
                 info_print("  No jp-RenderedMarkdown div found")
             return None
@@ -124,54 +440,45 @@ class NotebookConverter:
         if not markdown_source.strip():
             return None
         
-        # Split into lines and add newline to each (except possibly the last)
-        lines = markdown_source.split('\n')
-        source_lines = []
-        for i, line in enumerate(lines):
-            if i < len(lines) - 1:
-                source_lines.append(line + '\n')
-            else:
-                # Last line might or might not have a newline
-                if line:  # If there's content on the last line
-                    source_lines.append(line)
-                elif source_lines:  # If last line is empty but there are previous lines
-                    # Add newline to previous line if it doesn't have one
-                    if not source_lines[-1].endswith('\n'):
-                        source_lines[-1] += '\n'
-        
         return {
             'cell_type': 'markdown',
             'metadata': {},
-            'source': source_lines  # List of strings with \n characters
+            # List of strings with \n characters
+            'source': self._lines_to_source(markdown_source)
         }
+
+    @staticmethod
+    def _lines_to_source(text: str, final_newline: bool = False) -> List[str]:
+        """Split text into an nbformat source list, keeping newlines.
+
+        Code cells always end with a newline (final_newline=True);
+        markdown cells leave the last line as-is.
+        """
+        source_lines = text.splitlines(keepends=True)
+        if final_newline and source_lines and not source_lines[-1].endswith('\n'):
+            source_lines[-1] += '\n'
+        return source_lines
     
     def _extract_code_cell(self, cell_div) -> Optional[Dict]:
         """Extract code cell content."""
         # Try both new and old structures for backward compatibility
-        code_container = None
-        
-        # Try new JupyterLab structure first
-        code_container = cell_div.find('div', class_='jp-CodeMirrorEditor')
-        
-        # Fall back to older structure
-        if not code_container:
-            code_container = cell_div.find('div', class_='CodeMirror')
-            
-        if not code_container:
+        code_container = self.backend.code_container(cell_div)
+
+        if code_container is None:
             if self.verbose:
                 info_print("  No code container (jp-CodeMirrorEditor or CodeMirror) found")
             return None
-            
+
         # Look for the highlighted code
-        highlight_div = code_container.find('div', class_='highlight')
-        if not highlight_div:
+        highlight_div = self.backend.highlight_div(code_container)
+        if highlight_div is None:
             if self.verbose:
                 info_print("  No highlight div found")
             return None
-            
+
         # Extract code from <pre> tag, removing HTML markup
-        pre_tag = highlight_div.find('pre')
-        if not pre_tag:
+        pre_tag = self.backend.pre_tag(highlight_div)
+        if pre_tag is None:
             if self.verbose:
                 info_print("  No pre tag found")
             return None
@@ -184,24 +491,13 @@ class NotebookConverter:
         if not code_source.strip():
             return None
         
-        # Split into lines and add newline to each (except possibly the last)
-        lines = code_source.split('\n')
-        source_lines = []
-        for i, line in enumerate(lines):
-            if i < len(lines) - 1:
-                source_lines.append(line + '\n')
-            else:
-                # Last line might or might not have a newline
-                if line:  # If there's content on the last line
-                    source_lines.append(line + '\n')
-                # If last line is empty, we don't add it
-        
+        source_lines = self._lines_to_source(code_source, final_newline=True)
+
         # Look for execution count
         execution_count = None
-        prompt_div = cell_div.find('div', class_='jp-InputPrompt')
-        if prompt_div:
-            prompt_text = prompt_div.get_text().strip()
-            match = re.match(r'In\s*\[(\d+)\]:', prompt_text)
+        prompt_text = self.backend.prompt_text(cell_div).strip()
+        if prompt_text:
+            match = _PROMPT_RE.match(prompt_text)
             if match:
                 execution_count = int(match.group(1))
         
@@ -215,149 +511,132 @@ class NotebookConverter:
     
     def _remove_paragraph_symbols(self, text: str) -> str:
         """Remove paragraph symbols (¶) from text."""
-        # Remove all occurrences of the paragraph symbol
-        text = text.replace('¶', '')
-        
-        # Also remove any trailing whitespace that might have been before the symbol
-        lines = text.split('\n')
-        lines = [line.rstrip() for line in lines]
-        
-        return '\n'.join(lines)
+        # Very large cells take the compiled byte-level path when numba
+        # is available; compilation cost makes it a loss on small ones
+        if njit is not None and len(text) > _NUMBA_MIN_LEN:
+            buf = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+            out = np.empty(buf.shape[0], dtype=np.uint8)
+            end = _strip_pilcrow_trailws(buf, out)
+            return bytes(out[:end]).decode('utf-8')
+
+        # Drop the symbol, then strip any trailing whitespace that might
+        # have been before it — without a split/rstrip/join round trip
+        return _TRAIL_WS_RE.sub('', text.translate(_PILCROW_TABLE))
     
     def _html_to_markdown(self, element) -> str:
         """Convert HTML element back to markdown format."""
-        if not element:
+        if element is None:
             return ""
-        
-        # Handle different HTML elements and convert to markdown
-        result = []
-        
-        for child in element.children:
-            if hasattr(child, 'name') and child.name is not None:  # It's a tag
-                text = self._convert_html_tag_to_markdown(child)
-                if text:
-                    result.append(text)
-            else:  # It's text
-                text = str(child).strip()
-                if text:
-                    result.append(text)
-        
-        # Join and clean up
-        markdown_text = ''.join(result)
-        markdown_text = html.unescape(markdown_text)
-        
+
+        # Write all fragments into one shared buffer rather than
+        # building and joining per-node lists throughout the recursion
+        out = io.StringIO()
+        self._convert_children(element, out)
+
+        markdown_text = html.unescape(out.getvalue())
+
         # Clean up excessive whitespace
-        markdown_text = re.sub(r'\n\s*\n\s*\n+', '\n\n', markdown_text)
-        markdown_text = re.sub(r' +', ' ', markdown_text)
-        
+        markdown_text = _WS_RE.sub(
+            lambda m: '\n\n' if m.group(1) else ' ', markdown_text)
+
         return markdown_text.strip()
-    
-    def _convert_html_tag_to_markdown(self, tag) -> str:
-        """Convert HTML tag to markdown equivalent."""
-        if not tag.name:
-            return str(tag)
-            
-        tag_name = tag.name.lower()
-        
+
+    def _convert_children(self, element, out) -> None:
+        """Write markdown for element's children into the shared buffer."""
+        for child_name, child in self.backend.children(element):
+            if child_name is not None:  # It's a tag
+                self._convert_html_tag_to_markdown(child_name, child, out)
+            else:  # It's text
+                text = child.strip()
+                if text:
+                    out.write(text)
+
+    def _convert_html_tag_to_markdown(self, tag_name, tag, out) -> None:
+        """Write the markdown equivalent of an HTML tag into the buffer."""
         # Handle headers separately since they need special processing
         if tag_name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
             # For headers, look for and remove paragraph symbols
-            text_content = tag.get_text()
+            text_content = self.backend.get_text(tag)
             text_content = text_content.replace('¶', '').strip()
             prefix = '#' * int(tag_name[1])
-            return f"{prefix} {text_content}\n"
-        
-        text_content = tag.get_text()
-        
-        # Define tag converters as a dictionary of functions
-        def convert_strong():
-            return f"**{text_content}**"
-        
-        def convert_em():
-            return f"*{text_content}*"
-        
-        def convert_code():
-            return f"`{text_content}`"
-        
-        def convert_pre():
-            return f"```\n{text_content}\n```\n"
-        
-        def convert_p():
-            return f"{text_content}\n"
-        
-        def convert_br():
-            return '\n'
-        
-        def convert_a():
-            href = tag.get('href', '')
-            return f"[{text_content}]({href})" if href else text_content
-        
-        def convert_ul():
-            items = []
-            for li in tag.find_all('li', recursive=False):
-                items.append(f"- {li.get_text().strip()}")
-            return '\n'.join(items) + '\n'
-        
-        def convert_ol():
-            items = []
-            for i, li in enumerate(tag.find_all('li', recursive=False), 1):
-                items.append(f"{i}. {li.get_text().strip()}")
-            return '\n'.join(items) + '\n'
-        
-        def convert_blockquote():
-            lines = text_content.split('\n')
-            quoted_lines = [f"> {line}" for line in lines if line.strip()]
-            return '\n'.join(quoted_lines) + '\n'
-        
-        def convert_div_span():
-            # For divs and spans, recursively process children
-            result = []
-            for child in tag.children:
-                if hasattr(child, 'name') and child.name is not None:
-                    child_text = self._convert_html_tag_to_markdown(child)
-                    if child_text:
-                        result.append(child_text)
-                else:
-                    child_text = str(child).strip()
-                    if child_text:
-                        result.append(child_text)
-            return ''.join(result)
-        
-        def default_converter():
-            return text_content
-        
-        # Dictionary mapping tag names to converter functions
-        tag_converters = {
-            'strong': convert_strong,
-            'b': convert_strong,
-            'em': convert_em,
-            'i': convert_em,
-            'code': convert_code,
-            'pre': convert_pre,
-            'p': convert_p,
-            'br': convert_br,
-            'a': convert_a,
-            'ul': convert_ul,
-            'ol': convert_ol,
-            'blockquote': convert_blockquote,
-            'div': convert_div_span,
-            'span': convert_div_span,
-        }
-        
-        # Get the appropriate converter function or use default
-        converter = tag_converters.get(tag_name, default_converter)
-        return converter()
+            out.write(f"{prefix} {text_content}\n")
+            return
+
+        # Look up the converter in the class-level dispatch table; plain
+        # text is the default for unhandled tags. Converters that need
+        # the subtree text fetch it themselves, so interior nodes
+        # (div/span, lists) are not walked twice.
+        converter = self._TAG_CONVERTERS.get(tag_name)
+        if converter is not None:
+            converter(self, tag, out)
+        else:
+            out.write(self.backend.get_text(tag))
+
+    def _conv_strong(self, tag, out):
+        out.write(f"**{self.backend.get_text(tag)}**")
+
+    def _conv_em(self, tag, out):
+        out.write(f"*{self.backend.get_text(tag)}*")
+
+    def _conv_code(self, tag, out):
+        out.write(f"`{self.backend.get_text(tag)}`")
+
+    def _conv_pre(self, tag, out):
+        out.write(f"```\n{self.backend.get_text(tag)}\n```\n")
+
+    def _conv_p(self, tag, out):
+        out.write(f"{self.backend.get_text(tag)}\n")
+
+    def _conv_br(self, tag, out):
+        out.write('\n')
+
+    def _conv_a(self, tag, out):
+        text = self.backend.get_text(tag)
+        href = self.backend.attr(tag, 'href', '')
+        out.write(f"[{text}]({href})" if href else text)
+
+    def _conv_ul(self, tag, out):
+        for li in self.backend.list_items(tag):
+            out.write(f"- {self.backend.get_text(li).strip()}\n")
+
+    def _conv_ol(self, tag, out):
+        for i, li in enumerate(self.backend.list_items(tag), 1):
+            out.write(f"{i}. {self.backend.get_text(li).strip()}\n")
+
+    def _conv_blockquote(self, tag, out):
+        for line in self.backend.get_text(tag).split('\n'):
+            if line.strip():
+                out.write(f"> {line}\n")
+
+    def _conv_div_span(self, tag, out):
+        # For divs and spans, recursively process children
+        self._convert_children(tag, out)
+
+    # Dispatch table mapping tag names to converters, built once at
+    # class creation; entries are called as converter(self, tag, out)
+    _TAG_CONVERTERS = {
+        'strong': _conv_strong,
+        'b': _conv_strong,
+        'em': _conv_em,
+        'i': _conv_em,
+        'code': _conv_code,
+        'pre': _conv_pre,
+        'p': _conv_p,
+        'br': _conv_br,
+        'a': _conv_a,
+        'ul': _conv_ul,
+        'ol': _conv_ol,
+        'blockquote': _conv_blockquote,
+        'div': _conv_div_span,
+        'span': _conv_div_span,
+    }
     
     def _extract_code_from_html(self, pre_tag) -> str:
         """Extract Python code from HTML, removing syntax highlighting markup."""
-        # Look for any elements that might contain the paragraph symbol
-        # and remove them before extracting text
-        for elem in pre_tag.find_all(class_=lambda x: x and 'jp-' in str(x)):
-            if elem.string == '¶':
-                elem.decompose()
-        
-        # Simple approach: get_text() works well for most cases
-        code_text = pre_tag.get_text()
+        # Simple approach: get_text() works well for most cases; any
+        # paragraph symbols are stripped later at the text level by
+        # _remove_paragraph_symbols
+        code_text = self.backend.get_text(pre_tag)
         
         # Clean up HTML entities
         code_text = html.unescape(code_text)
@@ -374,43 +653,42 @@ class NotebookConverter:
             
         return '\n'.join(lines)
     
-    def _create_notebook(self, cells: List[Dict]) -> nbformat.NotebookNode:
-        """Create notebook structure with extracted cells."""
-        notebook = nbformat.v4.new_notebook()
-        
-        # Set metadata
-        notebook.metadata = {
-            'kernelspec': self.kernel_spec,
-            'language_info': {
-                'name': 'python',
-                'version': '3.8.0',
-                'mimetype': 'text/x-python',
-                'codemirror_mode': {'name': 'ipython', 'version': 3},
-                'pygments_lexer': 'ipython3',
-                'nbconvert_exporter': 'python',
-                'file_extension': '.py'
-            }
-        }
-        
-        # Add cells
+    def _create_notebook(self, cells: List[Dict]) -> Dict:
+        """Create the notebook JSON structure with extracted cells.
+
+        Builds the dict directly rather than going through the
+        nbformat.v4.new_*_cell constructors, which schema-validate and
+        re-wrap every cell; use --validate for a checked write.
+        """
+        nb_cells = []
         for cell_data in cells:
-            cell_type_handlers = {
-                'markdown': lambda: nbformat.v4.new_markdown_cell(
-                    source=cell_data['source'],
-                    metadata=cell_data['metadata']
-                ),
-                'code': lambda: nbformat.v4.new_code_cell(
-                    source=cell_data['source'],
-                    metadata=cell_data['metadata'],
-                    execution_count=cell_data.get('execution_count')
-                )
+            cell_type = cell_data['cell_type']
+            if cell_type not in ('markdown', 'code'):
+                continue
+            cell = {
+                'id': uuid.uuid4().hex[:8],
+                'cell_type': cell_type,
+                'metadata': cell_data['metadata'],
+                'source': cell_data['source'],
             }
-            
-            create_cell = cell_type_handlers.get(cell_data['cell_type'])
-            if create_cell:
-                notebook.cells.append(create_cell())
-            
-        return notebook
+            if cell_type == 'code':
+                cell['execution_count'] = cell_data.get('execution_count')
+                cell['outputs'] = cell_data.get('outputs', [])
+            nb_cells.append(cell)
+
+        return {
+            'nbformat': 4,
+            'nbformat_minor': 5,
+            'metadata': dict(self._METADATA_TEMPLATE),
+            'cells': nb_cells,
+        }
+
+
+def _write_notebook(notebook: Dict, fp) -> None:
+    """Write the notebook JSON in the same layout nbformat produces."""
+    json.dump(notebook, fp, indent=1, sort_keys=True,
+              separators=(',', ': '), ensure_ascii=False)
+    fp.write('\n')
 
 
 def main():
@@ -440,7 +718,12 @@ Examples:
         action='store_true',
         help='Enable verbose output for debugging'
     )
-    
+    parser.add_argument(
+        '--validate',
+        action='store_true',
+        help='Validate the notebook against the nbformat schema before writing'
+    )
+
     args = parser.parse_args()
     
     converter = NotebookConverter(verbose=args.verbose)
@@ -448,16 +731,19 @@ Examples:
     try:
         html_paths = [Path(f) for f in args.html_files]
         notebook = converter.html_to_notebook(html_paths)
-        
+
+        if args.validate:
+            nbformat.validate(nbformat.from_dict(notebook))
+
         if args.output:
             output_path = Path(args.output)
             with open(output_path, 'w', encoding='utf-8') as f:
-                nbformat.write(notebook, f)
+                _write_notebook(notebook, f)
             if not args.verbose:
                 info_print(f"Notebook written to {output_path}")
         else:
             # Write to stdout
-            nbformat.write(notebook, sys.stdout)
+            _write_notebook(notebook, sys.stdout)
             
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)